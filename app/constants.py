@@ -3,4 +3,13 @@ CHUNK_SIZE = 512
 CHUNK_OVERLAP = 50
 DB_PATH = "rag_database.db"
 MODEL = "http://localhost:8000"
-RAG_TOP_K = 5
\ No newline at end of file
+RAG_TOP_K = 5
+RERANKER_MODEL = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+RERANK_BATCH_SIZE = 32
+RERANK_MAX_LENGTH = 256
+RERANK_SCORE_MARGIN = 0.15
+RERANK_CACHE_SIZE = 4096
+DEDUP_THRESHOLD = 0.85
+MINHASH_PERMUTATIONS = 128
+MINHASH_BANDS = 16
+SHINGLE_SIZE = 5
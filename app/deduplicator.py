@@ -0,0 +1,111 @@
+import hashlib
+import re
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+from app.types import Chunk
+from app.logger import get_logger
+from app.constants import DEDUP_THRESHOLD, MINHASH_PERMUTATIONS, MINHASH_BANDS, SHINGLE_SIZE
+
+logger = get_logger(__name__)
+
+_MERSENNE_PRIME = (1 << 31) - 1
+
+class ChunkDeduplicator:
+    """Drop exact and near-duplicate chunks before embedding (content hash + MinHash LSH)"""
+    
+    def __init__(self, threshold: float = DEDUP_THRESHOLD, num_perm: int = MINHASH_PERMUTATIONS,
+                 bands: int = MINHASH_BANDS, shingle_size: int = SHINGLE_SIZE):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        
+        # Fixed seed so signatures are stable across runs
+        rng = np.random.RandomState(1)
+        self._a = rng.randint(1, _MERSENNE_PRIME, size=num_perm).astype(np.uint64)
+        self._b = rng.randint(0, _MERSENNE_PRIME, size=num_perm).astype(np.uint64)
+        self.stats = {}
+    
+    def deduplicate(self, chunks: List[Chunk]) -> Tuple[List[Chunk], List[Chunk]]:
+        """Split chunks into canonical chunks and duplicates pointing at them via duplicate_of"""
+        unique = []
+        duplicates = []
+        hashes: Dict[str, str] = {}
+        signatures: Dict[str, np.ndarray] = {}
+        buckets: Dict[Tuple[int, bytes], List[str]] = {}
+        exact_count = 0
+        near_count = 0
+        
+        for chunk in chunks:
+            text = self._normalize(chunk.content)
+            
+            # Exact match on content hash
+            content_hash = hashlib.sha256(text.encode()).hexdigest()
+            if content_hash in hashes:
+                chunk.duplicate_of = hashes[content_hash]
+                duplicates.append(chunk)
+                exact_count += 1
+                continue
+            
+            # Near-duplicate match via LSH candidates, verified by estimated Jaccard similarity
+            signature = self._minhash(text)
+            keys = [(band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+                    for band in range(self.bands)]
+            canonical_id = self._find_near_duplicate(signature, keys, buckets, signatures)
+            if canonical_id is not None:
+                chunk.duplicate_of = canonical_id
+                duplicates.append(chunk)
+                near_count += 1
+                continue
+            
+            hashes[content_hash] = chunk.id
+            signatures[chunk.id] = signature
+            for key in keys:
+                buckets.setdefault(key, []).append(chunk.id)
+            unique.append(chunk)
+        
+        self.stats = {
+            'total': len(chunks),
+            'unique': len(unique),
+            'exact_duplicates': exact_count,
+            'near_duplicates': near_count
+        }
+        logger.info(f"Deduplicated chunks: {self.stats}")
+        return unique, duplicates
+    
+    def _find_near_duplicate(self, signature: np.ndarray, keys: List[Tuple[int, bytes]],
+                             buckets: Dict, signatures: Dict) -> Optional[str]:
+        """Return the id of the first canonical chunk similar enough to this signature"""
+        seen = set()
+        for key in keys:
+            for candidate_id in buckets.get(key, []):
+                if candidate_id in seen:
+                    continue
+                seen.add(candidate_id)
+                similarity = np.mean(signature == signatures[candidate_id])
+                if similarity >= self.threshold:
+                    return candidate_id
+        return None
+    
+    def _minhash(self, text: str) -> np.ndarray:
+        """Compute the MinHash signature of the text's word shingles"""
+        words = text.split()
+        if len(words) <= self.shingle_size:
+            shingles = {" ".join(words)}
+        else:
+            shingles = {" ".join(words[i:i + self.shingle_size])
+                        for i in range(len(words) - self.shingle_size + 1)}
+        
+        hashed = np.array([int.from_bytes(hashlib.blake2b(s.encode(), digest_size=4).digest(), 'little')
+                           for s in shingles], dtype=np.uint64)
+        # (a * h + b) mod p stays below 2**64 since a < 2**31 and h < 2**32
+        permuted = (np.outer(hashed, self._a) + self._b) % np.uint64(_MERSENNE_PRIME)
+        return permuted.min(axis=0)
+    
+    def _normalize(self, text: str) -> str:
+        """Lowercase and collapse whitespace so formatting differences don't matter"""
+        return re.sub(r'\s+', ' ', text.lower()).strip()
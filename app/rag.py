@@ -3,10 +3,12 @@ from typing import Dict
 
 from app.document_loader import DocumentLoader
 from app.text_chunker import TextChunker
+from app.deduplicator import ChunkDeduplicator
 from app.embeddings_manager import EmbeddingManager
 from app.vector_db import VectorDatabase
-from app.reranker import Reranker
+from app.reranker import Reranker, CrossEncoderReranker
 from app.model import QwenAPI
+from app.types import Chunk
 from app.logger import get_logger
 from app.constants import DB_PATH, MODEL, RAG_TOP_K
 logger = get_logger(__name__)
@@ -15,13 +17,14 @@ class RAGSystem:
     """Main RAG system orchestrator"""
     
     def __init__(self, directory_path: str, db_path: str = DB_PATH, 
-                 qwen_base_url: str = MODEL):
+                 qwen_base_url: str = MODEL, cross_encoder: bool = False):
         self.directory_path = directory_path
         self.loader = DocumentLoader()
         self.chunker = TextChunker()
+        self.deduplicator = ChunkDeduplicator()
         self.embedding_manager = EmbeddingManager()
         self.vector_db = VectorDatabase(db_path)
-        self.reranker = Reranker()
+        self.reranker = CrossEncoderReranker() if cross_encoder else Reranker()
         self.qwen_api = QwenAPI(qwen_base_url)
         
         self.is_indexed = False
@@ -42,11 +45,15 @@ class RAGSystem:
         chunks = self.chunker.chunk_documents(documents)
         logger.info(f"Created {len(chunks)} chunks")
         
+        # Drop duplicates before spending embedding compute on them
+        chunks, duplicates = self.deduplicator.deduplicate(chunks)
+        logger.info(f"Removed {len(duplicates)} duplicate chunks")
+        
         # Generate embeddings
         chunks_with_embeddings = self.embedding_manager.encode_chunks(chunks)
         
         # Store in vector database
-        self.vector_db.store_chunks(chunks_with_embeddings)
+        self.vector_db.store_chunks(chunks_with_embeddings, duplicates)
         
         self.is_indexed = True
         logger.info("Indexing completed!")
@@ -76,7 +83,14 @@ class RAGSystem:
         # Prepare context from top chunks
         context_chunks = []
         for chunk, score in reranked_results:
-            context_chunks.append(f"Source: {chunk.metadata.get('filename', 'Unknown')}\n{chunk.content}")
+            duplicates = self.vector_db.get_duplicates(chunk.id)
+            if duplicates:
+                # Collapsed copies often share a filename, so list full paths to keep them apart
+                sources = [self._source_path(c) for c in [chunk] + duplicates]
+                source = ', '.join(dict.fromkeys(sources))
+            else:
+                source = chunk.metadata.get('filename', 'Unknown')
+            context_chunks.append(f"Source: {source}\n{chunk.content}")
         
         context = "\n\n---\n\n".join(context_chunks)
         
@@ -88,6 +102,10 @@ class RAGSystem:
         
         return response
     
+    def _source_path(self, chunk: Chunk) -> str:
+        """Get the source path of a chunk, falling back to its filename"""
+        return chunk.metadata.get('path') or chunk.metadata.get('filename', 'Unknown')
+    
     def _create_prompt(self, question: str, context: str) -> str:
         """Create prompt for the language model"""
         return f"""You are a helpful assistant that answers questions based on the provided context. Use the context to answer the question accurately and concisely.
@@ -110,6 +128,9 @@ Answer: """
         cursor.execute('SELECT COUNT(*) FROM chunks')
         chunk_count = cursor.fetchone()[0]
         
+        cursor.execute('SELECT COUNT(*) FROM chunk_refs')
+        duplicate_count = cursor.fetchone()[0]
+        
         cursor.execute('SELECT COUNT(*) FROM documents')
         doc_count = cursor.fetchone()[0]
         
@@ -118,5 +139,6 @@ Answer: """
         return {
             "total_documents": doc_count,
             "total_chunks": chunk_count,
+            "duplicate_chunks": duplicate_count,
             "embedding_dimension": self.embedding_manager.dimension
         }
@@ -1,8 +1,17 @@
-from typing import List,Tuple
-from sentence_transformers import SentenceTransformer
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from sentence_transformers import SentenceTransformer, CrossEncoder
 from sklearn.metrics.pairwise import cosine_similarity
 
 from app.types import Chunk 
+from app.logger import get_logger
+from app.constants import (
+    RERANKER_MODEL, RERANK_BATCH_SIZE, RERANK_MAX_LENGTH,
+    RERANK_SCORE_MARGIN, RERANK_CACHE_SIZE
+)
+
+logger = get_logger(__name__)
 
 class Reranker:
     """Simple reranking based on keyword matching and semantic similarity"""
@@ -53,3 +62,84 @@ class Reranker:
         
         overlap = len(query_words.intersection(text_words))
         return overlap / len(query_words)
+
+
+class CrossEncoderReranker(Reranker):
+    """Second-stage reranking with a cross-encoder over (query, chunk) pairs"""
+    
+    def __init__(self, model_name: str = RERANKER_MODEL, batch_size: int = RERANK_BATCH_SIZE,
+                 max_length: int = RERANK_MAX_LENGTH, score_margin: float = RERANK_SCORE_MARGIN,
+                 cache_size: int = RERANK_CACHE_SIZE):
+        # Reranker.__init__ is skipped on purpose: only the rerank() interface is shared, and
+        # self.model is a CrossEncoder here, not the base class's bi-encoder SentenceTransformer.
+        # rerank() is fully overridden, so no inherited code path calls self.model.encode.
+        self.model = CrossEncoder(model_name, max_length=max_length, device='cpu')
+        self.batch_size = batch_size
+        self.score_margin = score_margin
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self.last_stats = {}
+        logger.info(f"Loaded cross-encoder model: {model_name}, max_length: {max_length}")
+    
+    def rerank(self, query: str, results: List[Tuple[Chunk, float]], top_k: int = 5) -> List[Tuple[Chunk, float]]:
+        """Rerank results with the cross-encoder, scoring only the candidate shortlist"""
+        if not results:
+            return []
+        
+        start = time.perf_counter()
+        candidates = self._shortlist(results, top_k)
+        
+        # Only send uncached pairs to the model; the content hash guards against re-indexed chunks
+        keys = [(query, chunk.id, hash(chunk.content)) for chunk, _ in candidates]
+        scores: Dict[Tuple[str, str, int], float] = {}
+        for key in keys:
+            cached = self._cache_get(key)
+            if cached is not None:
+                scores[key] = cached
+        missing = [i for i, key in enumerate(keys) if key not in scores]
+        if missing:
+            pairs = [(query, candidates[i][0].content) for i in missing]
+            predicted = self.model.predict(pairs, batch_size=self.batch_size, show_progress_bar=False)
+            for i, score in zip(missing, predicted):
+                scores[keys[i]] = float(score)
+                self._cache_put(keys[i], float(score))
+        
+        ranked_results = [(chunk, scores[key]) for (chunk, _), key in zip(candidates, keys)]
+        ranked_results.sort(key=lambda x: x[1], reverse=True)
+        
+        self.last_stats = {
+            'candidates': len(results),
+            'scored': len(candidates),
+            'cache_hits': len(candidates) - len(missing),
+            'latency_ms': (time.perf_counter() - start) * 1000
+        }
+        logger.debug(f"Cross-encoder rerank stats: {self.last_stats}")
+        
+        return ranked_results[:top_k]
+    
+    def _shortlist(self, results: List[Tuple[Chunk, float]], top_k: int) -> List[Tuple[Chunk, float]]:
+        """Drop candidates whose first-stage score trails the best by more than the margin"""
+        ordered = sorted(results, key=lambda x: x[1], reverse=True)
+        cutoff = ordered[0][1] - self.score_margin
+        shortlist = [result for result in ordered if result[1] >= cutoff]
+        
+        # Always keep enough candidates to fill top_k
+        if len(shortlist) < top_k:
+            shortlist = ordered[:top_k]
+        return shortlist
+    
+    def _cache_get(self, key: Tuple[str, str, int]) -> Optional[float]:
+        """Read a cached pair score and mark it as recently used, or None on a miss"""
+        if key not in self._cache:
+            return None
+        self._cache.move_to_end(key)
+        return self._cache[key]
+    
+    def _cache_put(self, key: Tuple[str, str, int], score: float):
+        """Store a pair score, evicting the least recently used entry when full"""
+        if self.cache_size <= 0:
+            return
+        self._cache[key] = score
+        self._cache.move_to_end(key)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
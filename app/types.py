@@ -18,4 +18,5 @@ class Chunk:
     content: str
     document_id: str
     metadata: Dict
-    embedding: Optional[np.ndarray] = None
\ No newline at end of file
+    embedding: Optional[np.ndarray] = None
+    duplicate_of: Optional[str] = None
\ No newline at end of file
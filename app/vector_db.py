@@ -1,5 +1,5 @@
 import sqlite3
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 import json
 import faiss
 import numpy as np
@@ -16,6 +16,7 @@ class VectorDatabase:
         self.db_path = db_path
         self.index = None
         self.chunks = []
+        self.duplicates: Dict[str, List[Chunk]] = {}
         self._init_database()
     
     def _init_database(self):
@@ -33,6 +34,16 @@ class VectorDatabase:
             )
         ''')
         
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS chunk_refs (
+                id TEXT PRIMARY KEY,
+                canonical_id TEXT,
+                content TEXT,
+                document_id TEXT,
+                metadata TEXT
+            )
+        ''')
+        
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS documents (
                 id TEXT PRIMARY KEY,
@@ -44,11 +55,16 @@ class VectorDatabase:
         conn.commit()
         conn.close()
     
-    def store_chunks(self, chunks: List[Chunk]):
-        """Store chunks in database and FAISS index"""
+    def store_chunks(self, chunks: List[Chunk], duplicates: Optional[List[Chunk]] = None):
+        """Store chunks in database and FAISS index, and duplicates as references to them"""
+        duplicates = duplicates or []
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
+        # Chunks and references are rebuilt from scratch so they only reflect the current tree
+        cursor.execute('DELETE FROM chunks')
+        cursor.execute('DELETE FROM chunk_refs')
+        
         # Store in SQLite
         for chunk in chunks:
             cursor.execute('''
@@ -63,12 +79,27 @@ class VectorDatabase:
                 chunk.embedding.tobytes()
             ))
         
+        # Duplicates keep their own source metadata but are not embedded or indexed
+        for chunk in duplicates:
+            cursor.execute('''
+                INSERT OR REPLACE INTO chunk_refs 
+                (id, canonical_id, content, document_id, metadata)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (
+                chunk.id,
+                chunk.duplicate_of,
+                chunk.content,
+                chunk.document_id,
+                json.dumps(chunk.metadata)
+            ))
+        
         conn.commit()
         conn.close()
         
         # Build FAISS index
         self._build_faiss_index(chunks)
-        logger.info(f"Stored {len(chunks)} chunks in database")
+        self.duplicates = self._group_duplicates(duplicates)
+        logger.info(f"Stored {len(chunks)} chunks and {len(duplicates)} duplicate references in database")
     
     def _build_faiss_index(self, chunks: List[Chunk]):
         """Build FAISS index for vector similarity search"""
@@ -103,6 +134,17 @@ class VectorDatabase:
         
         return results
     
+    def get_duplicates(self, chunk_id: str) -> List[Chunk]:
+        """Get the duplicate chunks collapsed into a canonical chunk"""
+        return self.duplicates.get(chunk_id, [])
+    
+    def _group_duplicates(self, duplicates: List[Chunk]) -> Dict[str, List[Chunk]]:
+        """Group duplicate chunks by the canonical chunk they reference"""
+        grouped = {}
+        for chunk in duplicates:
+            grouped.setdefault(chunk.duplicate_of, []).append(chunk)
+        return grouped
+    
     def _load_index(self):
         """Load chunks from database and rebuild index"""
         conn = sqlite3.connect(self.db_path)
@@ -128,8 +170,22 @@ class VectorDatabase:
             chunks.append(chunk)
             embeddings.append(embedding)
         
+        cursor.execute('SELECT id, canonical_id, content, document_id, metadata FROM chunk_refs')
+        duplicates = [
+            Chunk(
+                id=chunk_id,
+                content=content,
+                document_id=doc_id,
+                metadata=json.loads(metadata_str),
+                duplicate_of=canonical_id
+            )
+            for chunk_id, canonical_id, content, doc_id, metadata_str in cursor.fetchall()
+        ]
+        
         conn.close()
         
+        self.duplicates = self._group_duplicates(duplicates)
+        
         if chunks:
             self.chunks = chunks
             self._build_faiss_index(chunks)
@@ -9,11 +9,12 @@ def main():
     parser.add_argument("--query", type=str, help="Query the RAG system")
     parser.add_argument("--qwen-url", default=MODEL, help="Qwen API base URL")
     parser.add_argument("--db-path", default=DB_PATH, help="Database path")
+    parser.add_argument("--cross-encoder", action="store_true", help="Rerank with a cross-encoder model")
     
     args = parser.parse_args()
     
     # Initialize RAG system
-    rag = RAGSystem(args.directory, args.db_path, args.qwen_url)
+    rag = RAGSystem(args.directory, args.db_path, args.qwen_url, args.cross_encoder)
     
     if args.build_index:
         rag.build_index()
@@ -21,6 +22,7 @@ def main():
         print(f"Index built successfully!")
         print(f"Documents: {stats['total_documents']}")
         print(f"Chunks: {stats['total_chunks']}")
+        print(f"Duplicate chunks removed: {stats['duplicate_chunks']}")
     
     if args.query:
         response = rag.query(args.query)
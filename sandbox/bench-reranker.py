@@ -0,0 +1,89 @@
+"""Measure the latency/quality trade-off of the cross-encoder reranker on CPU.
+
+Compares the adaptive shortlist against scoring every candidate (the reference
+ranking), and reports the default reranker's agreement with that reference.
+
+Usage: python sandbox/bench-reranker.py --db-path rag_database.db --query "..." [--query "..."]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+# The script lives in sandbox/, so put the repo root on the path for `app`
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.embeddings_manager import EmbeddingManager
+from app.vector_db import VectorDatabase
+from app.reranker import Reranker, CrossEncoderReranker
+from app.constants import DB_PATH, RAG_TOP_K, RERANK_SCORE_MARGIN
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--db-path", default=DB_PATH)
+parser.add_argument("--query", action="append", required=True)
+parser.add_argument("--top-k", type=int, default=RAG_TOP_K)
+parser.add_argument("--candidates", type=int, default=RAG_TOP_K * 4)
+parser.add_argument("--score-margin", type=float, default=RERANK_SCORE_MARGIN)
+parser.add_argument("--repeats", type=int, default=5, help="Timed runs per reranker; the median is reported")
+args = parser.parse_args()
+
+embedding_manager = EmbeddingManager()
+vector_db = VectorDatabase(args.db_path)
+baseline = Reranker()
+# Caching is disabled for the timed runs so every call pays for inference
+shortlist = CrossEncoderReranker(score_margin=args.score_margin, cache_size=0)
+full = CrossEncoderReranker(score_margin=float('inf'), cache_size=0)
+cached = CrossEncoderReranker(score_margin=args.score_margin)
+
+def agreement(ranked, reference):
+    """Fraction of the reference top-k also present in ranked"""
+    ids = {chunk.id for chunk, _ in ranked}
+    reference_ids = {chunk.id for chunk, _ in reference}
+    return len(ids & reference_ids) / max(len(reference_ids), 1)
+
+def timed(reranker, query, results):
+    """Rerank once and return the ranking with its wall-clock latency in ms"""
+    start = time.perf_counter()
+    ranked = reranker.rerank(query, results, args.top_k)
+    return ranked, (time.perf_counter() - start) * 1000
+
+# Untimed warm-up so one-time torch/tokenizer setup isn't charged to whichever runs first
+warmup_query = args.query[0]
+warmup_results = vector_db.search(embedding_manager.encode_query(warmup_query), k=args.candidates)
+for reranker in (baseline, full, shortlist):
+    reranker.rerank(warmup_query, warmup_results, args.top_k)
+
+for query in args.query:
+    results = vector_db.search(embedding_manager.encode_query(query), k=args.candidates)
+
+    # Alternate the order of full and shortlist runs and report medians over the repeats
+    rerankers = {'baseline': baseline, 'full': full, 'shortlist': shortlist}
+    latencies = {name: [] for name in rerankers}
+    rankings = {}
+    for repeat in range(args.repeats):
+        order = ['full', 'shortlist'] if repeat % 2 == 0 else ['shortlist', 'full']
+        for name in ['baseline'] + order:
+            rankings[name], ms = timed(rerankers[name], query, results)
+            latencies[name].append(ms)
+    baseline_ranked, full_ranked, shortlist_ranked = rankings['baseline'], rankings['full'], rankings['shortlist']
+    baseline_ms, full_ms, shortlist_ms = (statistics.median(latencies[name]) for name in rerankers)
+    full_stats, shortlist_stats = full.last_stats, shortlist.last_stats
+
+    # Second call exercises the (query, chunk) score cache
+    cached.rerank(query, results, args.top_k)
+    cached.rerank(query, results, args.top_k)
+    warm_stats = cached.last_stats
+
+    print(f"\nQuery: {query} (median of {args.repeats} runs)")
+    print(f"Full scoring (reference): {full_ms:.1f} ms, "
+          f"scored {full_stats['scored']}/{full_stats['candidates']} candidates")
+    print(f"Shortlist (margin {args.score_margin}): {shortlist_ms:.1f} ms, "
+          f"scored {shortlist_stats['scored']}/{shortlist_stats['candidates']} candidates, "
+          f"top-{args.top_k} agreement {agreement(shortlist_ranked, full_ranked):.0%}")
+    print(f"Shortlist (warm cache): {warm_stats['latency_ms']:.1f} ms, "
+          f"{warm_stats['cache_hits']} cache hits")
+    print(f"Default reranker: {baseline_ms:.1f} ms, "
+          f"top-{args.top_k} agreement {agreement(baseline_ranked, full_ranked):.0%}")
+    for rank, (chunk, score) in enumerate(full_ranked, 1):
+        print(f"  {rank}. [{score:.3f}] {chunk.metadata.get('filename', 'Unknown')}: {chunk.content[:80]}")